@@ -1,9 +1,19 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     govee_api_key: str
     govee_base_url: str = "https://openapi.api.govee.com/router/api/v1"
+    govee_mqtt_enabled: bool = False
+    govee_mqtt_host: str = "mqtt.openapi.govee.com"
+    govee_mqtt_port: int = 8883
+    govee_mqtt_tls: bool = True
+    govee_mqtt_topic: Optional[str] = None
+    govee_mqtt_backoff_min: float = 1.0
+    govee_mqtt_backoff_max: float = 60.0
+    govee_state_cache_ttl: float = 5.0
+    govee_event_ttl: float = 3600.0
 
     class Config:
         env_file = ".env"
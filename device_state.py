@@ -0,0 +1,86 @@
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+from config import settings
+
+
+class DeviceStateStore:
+    def __init__(self):
+        self._capabilities: Dict[Tuple[str, str], Dict[str, dict]] = {}
+        self._seeded: Dict[Tuple[str, str], float] = {}
+        self._segments: Dict[Tuple[str, str], Dict[int, int]] = {}
+        self._events: Dict[Tuple[str, str], Dict[str, Tuple[float, dict]]] = {}
+
+    def seed(self, device: str, sku: str, capabilities: List[dict]) -> None:
+        self.update(device, sku, capabilities)
+        self._seeded[(device, sku)] = time.monotonic()
+
+    def update(self, device: str, sku: str, capabilities: List[dict]) -> None:
+        known = self._capabilities.setdefault((device, sku), {})
+        for cap in capabilities:
+            instance = cap.get("instance")
+            if instance is not None:
+                known[instance] = cap
+
+    def apply_capability(self, device: str, sku: str, capability: dict) -> None:
+        instance = capability.get("instance")
+        value = capability.get("value")
+        if instance in ("colorRgb", "colorTemperatureK"):
+            self._segments.pop((device, sku), None)
+        elif instance == "segmentedColorRgb" and isinstance(value, dict):
+            segments = self._segments.setdefault((device, sku), {})
+            for segment in value.get("segment", []):
+                segments[segment] = value.get("rgb")
+        self.update(device, sku, [{
+            "type": capability.get("type"),
+            "instance": capability.get("instance"),
+            "state": {"value": capability.get("value")},
+        }])
+        # The API reports the inactive color mode's temperature as 0.
+        if instance == "colorRgb":
+            self.update(device, sku, [{
+                "type": capability.get("type"),
+                "instance": "colorTemperatureK",
+                "state": {"value": 0},
+            }])
+        elif instance == "colorTemperatureK":
+            self._capabilities[(device, sku)].pop("colorRgb", None)
+
+    def record_events(self, device: str, sku: str, capabilities: List[dict]) -> None:
+        events = self._events.setdefault((device, sku), {})
+        for cap in capabilities:
+            instance = cap.get("instance")
+            if instance is not None:
+                events[instance] = (time.monotonic(), cap)
+
+    def get_events(self, device: str, sku: str) -> List[dict]:
+        events = self._events.get((device, sku), {})
+        cutoff = time.monotonic() - settings.govee_event_ttl
+        for instance in [i for i, (received_at, _) in events.items() if received_at < cutoff]:
+            del events[instance]
+        return [cap for _, cap in events.values()]
+
+    def get_segment_colors(self, device: str, sku: str) -> Dict[int, int]:
+        return dict(self._segments.get((device, sku), {}))
+
+    def get_state(self, device: str, sku: str) -> Optional[dict]:
+        # Changes made outside this service are never pushed, so state is only
+        # trusted for a short while after the last API read.
+        seeded_at = self._seeded.get((device, sku))
+        if seeded_at is None:
+            return None
+        if time.monotonic() - seeded_at > settings.govee_state_cache_ttl:
+            return None
+        return {
+            "requestId": str(uuid.uuid4()),
+            "msg": "success",
+            "code": 200,
+            "payload": {
+                "sku": sku,
+                "device": device,
+                "capabilities": list(self._capabilities[(device, sku)].values()),
+            },
+        }
+
+
+device_state_store = DeviceStateStore()
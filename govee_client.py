@@ -2,6 +2,7 @@ import httpx
 import uuid
 from typing import List, Dict, Any, Optional
 from config import settings
+from device_state import device_state_store
 
 
 class GoveeClient:
@@ -27,7 +28,11 @@ class GoveeClient:
             response.raise_for_status()
             return response.json()
 
-    async def get_device_state(self, device: str, sku: str) -> dict:
+    async def get_device_state(self, device: str, sku: str, cached: bool = True) -> dict:
+        if cached:
+            state = device_state_store.get_state(device, sku)
+            if state is not None:
+                return state
         async with httpx.AsyncClient() as client:
             payload = {
                 "requestId": self._request_id(),
@@ -39,7 +44,9 @@ class GoveeClient:
                 json=payload,
             )
             response.raise_for_status()
-            return response.json()
+            state = response.json()
+            device_state_store.seed(device, sku, state.get("payload", {}).get("capabilities", []))
+            return state
 
     async def control_device(self, device: str, sku: str, capability: dict) -> dict:
         async with httpx.AsyncClient() as client:
@@ -57,6 +64,7 @@ class GoveeClient:
                 json=payload,
             )
             response.raise_for_status()
+            device_state_store.apply_capability(device, sku, capability)
             return response.json()
 
     async def turn_on(self, device: str, sku: str) -> dict:
@@ -178,15 +186,11 @@ class GoveeClient:
             {"type": capability_type, "instance": instance, "value": value}
         )
 
-    async def draw_canvas(self, device: str, sku: str, pixels: List[Dict[str, Any]]) -> dict:
+    def _unpack_rgb(self, data: bytes) -> List[int]:
+        return [(r << 16) + (g << 8) + b for r, g, b in zip(data[0::3], data[1::3], data[2::3])]
+
+    async def _draw_segments_by_color(self, device: str, sku: str, segments_by_color: Dict[int, List[int]]) -> dict:
         results = []
-        segments_by_color = {}
-        for pixel in pixels:
-            rgb = self._rgb_to_int(pixel["r"], pixel["g"], pixel["b"])
-            if rgb not in segments_by_color:
-                segments_by_color[rgb] = []
-            segments_by_color[rgb].append(pixel["segment"])
-        
         for rgb, segments in segments_by_color.items():
             r = (rgb >> 16) & 0xFF
             g = (rgb >> 8) & 0xFF
@@ -195,6 +199,21 @@ class GoveeClient:
             results.append(result)
         return {"results": results}
 
+    async def draw_canvas(self, device: str, sku: str, pixels: List[Dict[str, Any]]) -> dict:
+        segments_by_color = {}
+        for pixel in pixels:
+            rgb = self._rgb_to_int(pixel["r"], pixel["g"], pixel["b"])
+            if rgb not in segments_by_color:
+                segments_by_color[rgb] = []
+            segments_by_color[rgb].append(pixel["segment"])
+        return await self._draw_segments_by_color(device, sku, segments_by_color)
+
+    async def draw_canvas_packed(self, device: str, sku: str, data: bytes, start_segment: int = 0) -> dict:
+        segments_by_color = {}
+        for segment, rgb in enumerate(self._unpack_rgb(data), start_segment):
+            segments_by_color.setdefault(rgb, []).append(segment)
+        return await self._draw_segments_by_color(device, sku, segments_by_color)
+
     async def fill_canvas(self, device: str, sku: str, segments: List[int], r: int, g: int, b: int) -> dict:
         return await self.set_segment_color(device, sku, segments, r, g, b)
 
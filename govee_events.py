@@ -0,0 +1,83 @@
+import asyncio
+import json
+import logging
+import ssl
+from typing import Optional
+import aiomqtt
+from config import settings
+from device_state import DeviceStateStore, device_state_store
+
+logger = logging.getLogger(__name__)
+
+
+class GoveeEventSubscriber:
+    def __init__(self, store: DeviceStateStore):
+        self.store = store
+        self.host = settings.govee_mqtt_host
+        self.port = settings.govee_mqtt_port
+        self.topic = settings.govee_mqtt_topic or f"GA/{settings.govee_api_key}"
+        self._task: Optional[asyncio.Task] = None
+
+    def _client(self) -> aiomqtt.Client:
+        return aiomqtt.Client(
+            hostname=self.host,
+            port=self.port,
+            username=settings.govee_api_key,
+            password=settings.govee_api_key,
+            tls_context=ssl.create_default_context() if settings.govee_mqtt_tls else None,
+        )
+
+    def handle_message(self, payload: bytes) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed Govee event: %r", payload)
+            return
+        if not isinstance(event, dict):
+            logger.warning("Ignoring malformed Govee event: %r", payload)
+            return
+        device = event.get("device")
+        sku = event.get("sku")
+        capabilities = event.get("capabilities", [])
+        if not device or not sku or not isinstance(capabilities, list):
+            logger.warning("Ignoring malformed Govee event: %r", payload)
+            return
+        self.store.record_events(device, sku, [cap for cap in capabilities if isinstance(cap, dict)])
+
+    async def _run(self) -> None:
+        delay = settings.govee_mqtt_backoff_min
+        while True:
+            try:
+                async with self._client() as client:
+                    await client.subscribe(self.topic)
+                    delay = settings.govee_mqtt_backoff_min
+                    logger.info("Subscribed to Govee events on %s:%s", self.host, self.port)
+                    async for message in client.messages:
+                        try:
+                            self.handle_message(message.payload)
+                        except Exception:
+                            logger.exception("Failed to apply Govee event: %r", message.payload)
+            except aiomqtt.MqttError as e:
+                logger.warning("Govee event connection lost: %s", e)
+            except Exception:
+                logger.exception("Govee event subscriber failed")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.govee_mqtt_backoff_max)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.exception("Govee event subscriber stopped with an error")
+            self._task = None
+
+
+event_subscriber = GoveeEventSubscriber(device_state_store)
@@ -1,17 +1,33 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query
+from config import settings
+from device_state import device_state_store
 from govee_client import govee_client
+from govee_events import event_subscriber
 from models import (
     DeviceIdentifier, PowerCommand, BrightnessCommand, ColorCommand, ColorTempCommand,
     ToggleCommand, SegmentColorCommand, SegmentBrightnessCommand, SceneCommand,
     DiySceneCommand, SnapshotCommand, MusicModeCommand, WorkModeCommand, RangeCommand,
-    GenericCapabilityCommand, CanvasDrawCommand, CanvasFillCommand, CanvasClearCommand
+    GenericCapabilityCommand, CanvasDrawCommand, CanvasFillCommand, CanvasClearCommand,
+    RoomSnapshotCommand
 )
+from room_snapshots import room_snapshot_store
 from typing import Optional
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.govee_mqtt_enabled:
+        event_subscriber.start()
+    yield
+    await event_subscriber.stop()
+
+
 app = FastAPI(
     title="Govee Lights API",
     version="2.0.0",
-    description="FastAPI wrapper for Govee Developer API v2 with canvas drawing support"
+    description="FastAPI wrapper for Govee Developer API v2 with canvas drawing support",
+    lifespan=lifespan
 )
 
 
@@ -46,6 +62,11 @@ async def get_device_state_get(device_id: str, sku: str = Query(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/devices/{device_id}/events")
+async def get_device_events(device_id: str, sku: str = Query(...)):
+    return {"device": device_id, "sku": sku, "events": device_state_store.get_events(device_id, sku)}
+
+
 @app.get("/devices/{device_id}/capabilities")
 async def get_device_capabilities(device_id: str, sku: str = Query(...)):
     try:
@@ -144,7 +165,7 @@ async def get_device_current_color(device_id: str, sku: str = Query(...)):
         for cap in capabilities:
             instance = cap.get("instance")
             state = cap.get("state", {})
-            value = state.get("value")
+            value = state.get("value") if isinstance(state, dict) else None
             if instance == "online":
                 result["online"] = value
             elif instance == "powerSwitch":
@@ -336,6 +357,8 @@ async def generic_control(cmd: GenericCapabilityCommand):
 @app.post("/canvas/draw")
 async def canvas_draw(cmd: CanvasDrawCommand):
     try:
+        if cmd.rgb is not None:
+            return await govee_client.draw_canvas_packed(cmd.device, cmd.sku, cmd.rgb, cmd.start_segment)
         pixels = [{"segment": p.segment, "r": p.r, "g": p.g, "b": p.b} for p in cmd.pixels]
         return await govee_client.draw_canvas(cmd.device, cmd.sku, pixels)
     except Exception as e:
@@ -355,4 +378,41 @@ async def canvas_clear(cmd: CanvasClearCommand):
     try:
         return await govee_client.clear_canvas(cmd.device, cmd.sku)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/room-snapshots")
+async def list_room_snapshots():
+    return {"snapshots": room_snapshot_store.list()}
+
+
+@app.post("/room-snapshots")
+async def create_room_snapshot(cmd: RoomSnapshotCommand):
+    try:
+        devices = [{"device": d.device, "sku": d.sku} for d in cmd.devices]
+        return await room_snapshot_store.capture(cmd.name, devices)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/room-snapshots/{name}")
+async def get_room_snapshot(name: str):
+    snapshot = room_snapshot_store.get(name)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return snapshot
+
+
+@app.delete("/room-snapshots/{name}")
+async def delete_room_snapshot(name: str):
+    if not room_snapshot_store.delete(name):
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return {"name": name, "deleted": True}
+
+
+@app.post("/room-snapshots/{name}/restore")
+async def restore_room_snapshot(name: str):
+    result = await room_snapshot_store.restore(name)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return result
\ No newline at end of file
@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Any, Dict
+import base64
+import binascii
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
+from typing import Optional, List, Any, Dict, Literal
 
 
 class DeviceIdentifier(BaseModel):
@@ -118,7 +120,34 @@ class CanvasPixel(BaseModel):
 class CanvasDrawCommand(BaseModel):
     device: str
     sku: str
-    pixels: List[CanvasPixel]
+    pixels: Optional[List[CanvasPixel]] = None
+    encoding: Literal["hex", "base64"] = "hex"
+    rgb: Optional[bytes] = None
+    start_segment: int = Field(0, ge=0)
+
+    @field_validator("rgb", mode="before")
+    @classmethod
+    def decode_rgb(cls, value: Any, info: ValidationInfo) -> Any:
+        if not isinstance(value, str) or "encoding" not in info.data:
+            return value
+        try:
+            if info.data["encoding"] == "base64":
+                data = base64.b64decode(value, validate=True)
+            else:
+                data = bytes.fromhex(value)
+        except (ValueError, binascii.Error):
+            raise ValueError("rgb is not valid for the given encoding")
+        if not data:
+            raise ValueError("rgb must not be empty")
+        if len(data) % 3:
+            raise ValueError("rgb must contain 3 bytes per segment")
+        return data
+
+    @model_validator(mode="after")
+    def check_pixel_source(self) -> "CanvasDrawCommand":
+        if (self.pixels is None) == (self.rgb is None):
+            raise ValueError("exactly one of pixels or rgb must be provided")
+        return self
 
 
 class CanvasFillCommand(BaseModel):
@@ -132,4 +161,9 @@ class CanvasFillCommand(BaseModel):
 
 class CanvasClearCommand(BaseModel):
     device: str
-    sku: str
\ No newline at end of file
+    sku: str
+
+
+class RoomSnapshotCommand(BaseModel):
+    name: str
+    devices: List[DeviceIdentifier]
\ No newline at end of file
@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from device_state import device_state_store
+from govee_client import govee_client
+
+POWER = "devices.capabilities.on_off"
+RANGE = "devices.capabilities.range"
+COLOR = "devices.capabilities.color_setting"
+SEGMENT_COLOR = "devices.capabilities.segment_color_setting"
+
+
+def _state_values(state_response: dict) -> Dict[str, Any]:
+    values = {}
+    for cap in state_response.get("payload", {}).get("capabilities", []):
+        state = cap.get("state", {})
+        if isinstance(state, dict):
+            values[cap.get("instance")] = state.get("value")
+    return values
+
+
+def _color_differs(cap: dict, current: Dict[str, Any]) -> bool:
+    # A non-zero colorTemperatureK means the device is in color temperature mode.
+    if cap["instance"] == "colorRgb":
+        return bool(current.get("colorTemperatureK")) or current.get("colorRgb") != cap["value"]
+    return current.get("colorTemperatureK") != cap["value"]
+
+
+class RoomSnapshotStore:
+    def __init__(self):
+        self._snapshots: Dict[str, dict] = {}
+
+    def list(self) -> List[dict]:
+        return list(self._snapshots.values())
+
+    def get(self, name: str) -> Optional[dict]:
+        return self._snapshots.get(name)
+
+    def delete(self, name: str) -> bool:
+        return self._snapshots.pop(name, None) is not None
+
+    async def _capture_device(self, device: str, sku: str) -> dict:
+        try:
+            values = _state_values(await govee_client.get_device_state(device, sku))
+        except Exception as e:
+            return {"device": device, "sku": sku, "capabilities": [], "error": str(e)}
+        capabilities = []
+        if values.get("powerSwitch") is not None:
+            capabilities.append({"type": POWER, "instance": "powerSwitch", "value": values["powerSwitch"]})
+        if values.get("brightness") is not None:
+            capabilities.append({"type": RANGE, "instance": "brightness", "value": values["brightness"]})
+        if values.get("colorTemperatureK"):
+            capabilities.append({"type": COLOR, "instance": "colorTemperatureK", "value": values["colorTemperatureK"]})
+        elif isinstance(values.get("colorRgb"), int):
+            capabilities.append({"type": COLOR, "instance": "colorRgb", "value": values["colorRgb"]})
+        segments_by_color = {}
+        for segment, rgb in sorted(device_state_store.get_segment_colors(device, sku).items()):
+            segments_by_color.setdefault(rgb, []).append(segment)
+        for rgb, segments in segments_by_color.items():
+            capabilities.append({
+                "type": SEGMENT_COLOR,
+                "instance": "segmentedColorRgb",
+                "value": {"segment": segments, "rgb": rgb},
+            })
+        return {"device": device, "sku": sku, "capabilities": capabilities}
+
+    async def capture(self, name: str, devices: List[Dict[str, str]]) -> dict:
+        captured = await asyncio.gather(*(self._capture_device(d["device"], d["sku"]) for d in devices))
+        snapshot = {"name": name, "devices": list(captured)}
+        self._snapshots[name] = snapshot
+        return snapshot
+
+    def _diff(
+        self, saved: List[dict], current: Dict[str, Any], segment_colors: Dict[int, int]
+    ) -> Tuple[List[dict], List[int]]:
+        power = next((cap["value"] for cap in saved if cap["instance"] == "powerSwitch"), None)
+        if power == 0:
+            # Anything else sent to a switched-off light would turn it back on.
+            saved = [cap for cap in saved if cap["instance"] == "powerSwitch"]
+        saved_segments = {s for cap in saved if cap["instance"] == "segmentedColorRgb" for s in cap["value"]["segment"]}
+        # Segments painted since the snapshot are only undone by a whole-device color.
+        stray_segments = sorted(s for s in segment_colors if s not in saved_segments)
+        repaint = bool(stray_segments)
+        changes = []
+        for cap in saved:
+            if cap["instance"] == "segmentedColorRgb":
+                rgb = cap["value"]["rgb"]
+                segments = [s for s in cap["value"]["segment"] if segment_colors.get(s) != rgb]
+                if segments:
+                    changes.append({**cap, "value": {"segment": segments, "rgb": rgb}})
+            elif cap["instance"] in ("colorRgb", "colorTemperatureK"):
+                if repaint or _color_differs(cap, current):
+                    # A whole-device color repaints every segment.
+                    segment_colors = {}
+                    changes.append(cap)
+            elif current.get(cap["instance"]) != cap["value"]:
+                changes.append(cap)
+        if any(cap["instance"] in ("colorRgb", "colorTemperatureK") for cap in saved):
+            stray_segments = []
+        return changes, stray_segments
+
+    async def _restore_device(self, saved: dict) -> dict:
+        device, sku = saved["device"], saved["sku"]
+        result = {"device": device, "sku": sku, "sent": []}
+        if "error" in saved:
+            result["error"] = f"Device was not captured: {saved['error']}"
+            return result
+        try:
+            current = _state_values(await govee_client.get_device_state(device, sku, cached=False))
+            segment_colors = device_state_store.get_segment_colors(device, sku)
+            changes, unrestored = self._diff(saved["capabilities"], current, segment_colors)
+            if unrestored:
+                # Without a saved whole-device color there is nothing to paint these back to.
+                result["unrestoredSegments"] = unrestored
+            for cap in changes:
+                await govee_client.control_device(device, sku, cap)
+                result["sent"].append(cap)
+        except Exception as e:
+            result["error"] = str(e)
+        return result
+
+    async def restore(self, name: str) -> Optional[dict]:
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            return None
+        results = await asyncio.gather(*(self._restore_device(saved) for saved in snapshot["devices"]))
+        return {"name": name, "results": list(results)}
+
+
+room_snapshot_store = RoomSnapshotStore()